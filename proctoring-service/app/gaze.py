@@ -1,219 +1,767 @@
-import base64
+import contextlib
+import functools
+import itertools
+import multiprocessing
+import os
+import queue
 import cv2
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 import numpy as np
 import mediapipe as mp
-from utils import is_looking_away, YAW_THRESHOLD, PITCH_THRESHOLD
+from mediapipe.tasks.python import BaseOptions
+from mediapipe.tasks.python.vision import (
+    FaceLandmarker,
+    FaceLandmarkerOptions,
+    RunningMode,
+)
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# libjpeg-turbo's SIMD decoder, when both PyTurboJPEG and the library exist
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo = TurboJPEG()
+except Exception as e:
+    print(f"libjpeg-turbo decoder unavailable, decoding with OpenCV: {e!r}")
+    _turbo = None
+
+from utils import is_looking_away, YAW_THRESHOLD, PITCH_THRESHOLD, NEUTRAL_PITCH
 
 mp_face = mp.solutions.face_mesh
-face_mesh_lock = threading.Lock()
-face_mesh = mp_face.FaceMesh(
-    static_image_mode=False,
-    max_num_faces=1,
-    refine_landmarks=True,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
-)
 
-def analyze_gaze(base64_img: str) -> bool:
+_MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+# An int8-quantized bundle runs on XNNPACK's int8 kernels (the CPU default),
+# halving weight bandwidth, so it wins over the float16 one when installed
+_MODEL_NAMES = ("face_landmarker_int8.task", "face_landmarker.task")
+
+
+def _default_model_path() -> str:
+    for name in _MODEL_NAMES:
+        path = os.path.join(_MODEL_DIR, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(_MODEL_DIR, _MODEL_NAMES[-1])
+
+
+MODEL_PATH = os.environ.get("FACE_LANDMARKER_MODEL") or _default_model_path()
+
+
+@functools.lru_cache(maxsize=None)
+def _model_asset():
+    """The model bundle's bytes, read once per process for every model."""
+    try:
+        with open(MODEL_PATH, "rb") as f:
+            return f.read()
+    except OSError as e:
+        print(f"FaceLandmarker model unavailable: {e}")
+        return None
+
+
+# Delegates that failed to load once in this process; later models skip them
+_failed_delegates = set()
+
+
+def _create_face_mesh(refine: bool = True, video: bool = True):
+    """
+    Create the face landmark model: the Tasks FaceLandmarker on GPU, then on
+    CPU, and the legacy FaceMesh solution if the Tasks model can't be loaded.
+    video=True gives a model that tracks the face across consecutive frames
+    of one stream (VIDEO mode / legacy tracking); video=False treats every
+    frame on its own. refine only applies to the legacy solution (the Tasks
+    bundle always includes the iris/lip refinement).
+    """
+    model_asset = _model_asset()
+    for delegate in (BaseOptions.Delegate.GPU, BaseOptions.Delegate.CPU):
+        if model_asset is None or delegate in _failed_delegates:
+            continue
+        try:
+            options = FaceLandmarkerOptions(
+                base_options=BaseOptions(model_asset_buffer=model_asset, delegate=delegate),
+                running_mode=RunningMode.VIDEO if video else RunningMode.IMAGE,
+                num_faces=1,
+                min_face_detection_confidence=0.7,
+                min_face_presence_confidence=0.7,
+                min_tracking_confidence=0.7
+            )
+            return FaceLandmarker.create_from_options(options)
+        except Exception as e:
+            _failed_delegates.add(delegate)
+            print(f"FaceLandmarker ({delegate.name}) unavailable: {e}")
+
+    return mp_face.FaceMesh(
+        static_image_mode=not video,
+        max_num_faces=1,
+        refine_landmarks=refine,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+
+
+# Per-thread scratch buffers (decode output, RGB conversion)
+_tls = threading.local()
+
+# Server processes sharing the cores (WEB_CONCURRENCY, as uvicorn reads it)
+_SERVER_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+# Single-frame landmark models, checked out of a shared pool for each call so
+# concurrent requests don't serialize on one. They aren't tied to threads:
+# the server retires idle worker threads, which would drop their models
+# without close() and leak the native memory. Sized to the inference threads
+# (one per core); a caller beyond that waits for a model to come back.
+FRAME_MODELS_MAX = max((os.cpu_count() or 4) // _SERVER_WORKERS, 1)
+_frame_models = {True: queue.LifoQueue(), False: queue.LifoQueue()}
+_frame_models_created = {True: 0, False: 0}
+_frame_models_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _frame_model(refine: bool):
+    """Check a single-frame landmark model out of the pool for the block."""
+    if _model_asset() is not None:
+        refine = True  # the Tasks bundle ignores refine, so share one pool
+    pool = _frame_models[refine]
+    try:
+        face_mesh = pool.get_nowait()
+    except queue.Empty:
+        with _frame_models_lock:
+            create = _frame_models_created[refine] < FRAME_MODELS_MAX
+            if create:
+                _frame_models_created[refine] += 1
+        if not create:
+            face_mesh = pool.get()
+        else:
+            try:
+                face_mesh = _create_face_mesh(refine, video=False)
+            except Exception:
+                with _frame_models_lock:
+                    _frame_models_created[refine] -= 1
+                raise
+    try:
+        yield face_mesh
+    finally:
+        pool.put(face_mesh)
+
+
+def close_frame_models():
+    """Close the pooled single-frame models (at shutdown)."""
+    for refine, pool in _frame_models.items():
+        while True:
+            try:
+                face_mesh = pool.get_nowait()
+            except queue.Empty:
+                break
+            face_mesh.close()
+            with _frame_models_lock:
+                _frame_models_created[refine] -= 1
+
+
+class _TrackingModel:
+    """A landmark model that tracks the face across one stream's frames."""
+
+    def __init__(self, refine: bool):
+        self.model = _create_face_mesh(refine, video=True)
+        # A model instance isn't safe to call concurrently, and VIDEO mode
+        # requires strictly increasing timestamps per instance
+        self.lock = threading.Lock()
+        self.last_timestamp_ms = 0
+
+
+# Tracking models for the local monitor's camera stream, by refine. HTTP
+# frames use the single-frame pool instead: clients post a frame every couple
+# of seconds, too far apart for tracking to skip much detection, and a VIDEO
+# model per session (~30 MB each) would grow with the number of candidates.
+_tracking_models = {}
+_tracking_models_lock = threading.Lock()
+
+
+def _get_tracking_model(refine: bool) -> _TrackingModel:
+    with _tracking_models_lock:
+        tracking = _tracking_models.get(refine)
+        if tracking is None:
+            tracking = _tracking_models[refine] = _TrackingModel(refine)
+        return tracking
+
+
+def _run_model(face_mesh, rgb: np.ndarray, timestamp_ms: int = None) -> list:
+    if isinstance(face_mesh, FaceLandmarker):
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        if timestamp_ms is None:
+            return face_mesh.detect(mp_image).face_landmarks
+        return face_mesh.detect_for_video(mp_image, timestamp_ms).face_landmarks
+
+    results = face_mesh.process(rgb)
+    return [face.landmark for face in results.multi_face_landmarks or []]
+
+
+def _detect_faces(rgb: np.ndarray, track: bool = False, refine: bool = True) -> list:
+    """
+    Run landmark detection on an RGB frame; returns one landmark list per face.
+    With track the frame goes to the monitor stream's tracking model, which
+    only re-runs face detection when it loses the face; otherwise it is
+    analyzed on its own by a pooled model. refine=False skips the legacy iris
+    refinement pass, which head pose (eye corners and chin only) doesn't need.
+    """
+    if not track:
+        with _frame_model(refine) as face_mesh:
+            return _run_model(face_mesh, rgb)
+
+    tracking = _get_tracking_model(refine)
+    with tracking.lock:
+        timestamp_ms = max(int(time.monotonic() * 1000), tracking.last_timestamp_ms + 1)
+        tracking.last_timestamp_ms = timestamp_ms
+        return _run_model(tracking.model, rgb, timestamp_ms)
+
+
+# Frames are brought down to fit 320x240 (either orientation) before
+# analysis: enough for the landmark model, and far fewer pixels to process
+MAX_FRAME_SIZE = (320, 240)
+# libjpeg-turbo can downscale during the IDCT, which is nearly free
+_TURBO_SCALES = ((1, 8), (1, 4), (1, 2), (1, 1))
+# Canvas-captured JPEGs carry no EXIF orientation, so skip looking for it.
+# Full resolution: a fixed reduced-size flag would halve frames that are
+# already within MAX_FRAME_SIZE, and _fit_frame does the shrinking anyway
+_IMDECODE_FLAGS = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+_DECODE_BUFFERS_MAX = 4
+
+
+def _fit_scale(width: int, height: int) -> float:
+    long_side, short_side = max(width, height), min(width, height)
+    return min(MAX_FRAME_SIZE[0] / long_side, MAX_FRAME_SIZE[1] / short_side, 1.0)
+
+
+def _turbo_scale(width: int, height: int) -> tuple:
+    """Strongest IDCT downscale that doesn't go below MAX_FRAME_SIZE."""
+    target = _fit_scale(width, height)
+    for num, denom in _TURBO_SCALES:
+        if num / denom >= target:
+            return num, denom
+    return 1, 1
+
+
+def _decode_buffer(shape: tuple) -> np.ndarray:
+    """Per-thread output buffer for decoded frames of the given shape."""
+    buffers = getattr(_tls, "decode_buffers", None)
+    if buffers is None:
+        buffers = _tls.decode_buffers = {}
+    buf = buffers.get(shape)
+    if buf is None:
+        if len(buffers) >= _DECODE_BUFFERS_MAX:
+            buffers.clear()
+        buf = buffers[shape] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+def _fit_frame(image: np.ndarray, reuse_buffer: bool) -> np.ndarray:
+    """Shrink a decoded frame to fit MAX_FRAME_SIZE, if it doesn't already."""
+    img_h, img_w = image.shape[:2]
+    scale = _fit_scale(img_w, img_h)
+    size = (max(round(img_w * scale), 1), max(round(img_h * scale), 1))
+    if size == (img_w, img_h):
+        return image
+    dst = _decode_buffer((size[1], size[0], 3)) if reuse_buffer else None
+    return cv2.resize(image, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+
+def _decode_jpeg(img_bytes: bytes, reuse_buffer: bool = True):
+    """
+    Decode JPEG bytes to a BGR frame that fits MAX_FRAME_SIZE. With
+    reuse_buffer the frame lands in a per-thread buffer that the next decode
+    on this thread overwrites. Returns None if the data can't be decoded.
+    """
+    image = None
+    if _turbo is not None:
+        try:
+            width, height, _, _ = _turbo.decode_header(img_bytes)
+            num, denom = scale = _turbo_scale(width, height)
+            # Same rounding as libjpeg-turbo's TJSCALED (round up)
+            shape = (-(-height * num // denom), -(-width * num // denom), 3)
+            if not reuse_buffer:
+                image = _turbo.decode(img_bytes, pixel_format=TJPF_BGR, scaling_factor=scale)
+            else:
+                image = _turbo.decode(
+                    img_bytes, pixel_format=TJPF_BGR, scaling_factor=scale,
+                    dst=_decode_buffer(shape)
+                )
+        except Exception:
+            image = None  # let OpenCV have a go (and report failure as None)
+    if image is None:
+        image = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), _IMDECODE_FLAGS)
+        if image is None:
+            return None
+    return _fit_frame(image, reuse_buffer)
+
+
+def _to_rgb(image: np.ndarray, in_place: bool = False) -> np.ndarray:
+    """
+    Convert BGR to RGB. With in_place the frame itself is overwritten, saving
+    a full image write; otherwise a per-thread buffer is used instead of a
+    fresh array.
+    """
+    if in_place and image.flags.c_contiguous and image.flags.writeable:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+    # Flat buffer that only grows, so frames of varying size reuse it too
+    buf = getattr(_tls, "rgb", None)
+    if buf is None or buf.size < image.size:
+        buf = np.empty(image.size, dtype=np.uint8)
+        _tls.rgb = buf
+    dst = buf[:image.size].reshape(image.shape)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=dst)
+
+
+# Results of recently seen payloads, so retransmitted frames (network
+# retries, double submits) skip decoding and inference entirely
+_PAYLOAD_CACHE_MAX = 128
+_payload_cache = OrderedDict()
+_payload_cache_lock = threading.Lock()
+
+
+def _payload_hash(payload: bytes) -> int:
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(payload)
+    return hash(payload)
+
+
+def _cached_payload(h: int):
+    with _payload_cache_lock:
+        return _payload_cache.get(h)
+
+
+def _store_payload(h: int, result):
+    with _payload_cache_lock:
+        _payload_cache[h] = result
+        if len(_payload_cache) > _PAYLOAD_CACHE_MAX:
+            _payload_cache.popitem(last=False)
+
+
+# Mean absolute difference (0-255) of the 32x32 thumbnail below which a frame
+# counts as unchanged and the previous result is reused
+FRAME_DIFF_THRESHOLD = 3.0
+_LAST_FRAMES_MAX = 256
+
+# (kind, session_id) -> (thumbnail, result) of the last analyzed frame
+_last_frames = OrderedDict()
+_last_frames_lock = threading.Lock()
+
+
+def _session_key(kind: str, session_id):
+    """
+    Key for per-client state (the frame cache), or None without a
+    session_id: anonymous clients can't be told apart, so they get none.
+    """
+    return None if session_id is None else (kind, session_id)
+
+
+def _thumbnail(image: np.ndarray) -> np.ndarray:
+    small = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+
+def _cached_result(key, small: np.ndarray):
+    """Return the previous result for key if the frame barely changed."""
+    if key is None:
+        return None
+    with _last_frames_lock:
+        entry = _last_frames.get(key)
+    if entry is None:
+        return None
+    last_small, result = entry
+    if np.abs(small - last_small).mean() < FRAME_DIFF_THRESHOLD:
+        return result
+    return None
+
+
+def _store_result(key, small: np.ndarray, result):
+    if key is None:
+        return
+    with _last_frames_lock:
+        _last_frames[key] = (small, result)
+        _last_frames.move_to_end(key)
+        if len(_last_frames) > _LAST_FRAMES_MAX:
+            _last_frames.popitem(last=False)
+
+
+def _find_faces(image: np.ndarray, in_place: bool = False, refine: bool = True,
+                track: bool = False) -> list:
+    """
+    Detect faces on a BGR frame (see _detect_faces). Pass in_place=True if
+    the caller no longer needs the BGR pixels; the frame is then converted to
+    RGB in place.
+    """
+    return _detect_faces(_to_rgb(image, in_place), track, refine)
+
+
+def analyze_gaze_bytes(img_bytes: bytes, session_id: str = None) -> bool:
     try:
-        img_bytes = base64.b64decode(base64_img)
-        img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+        payload_hash = _payload_hash(img_bytes)
+        cached = _cached_payload(payload_hash)
+        if cached is not None:
+            return cached
+
+        img = _decode_jpeg(img_bytes)
         
         # Check if image was decoded successfully
         if img is None or img.size == 0:
             print("Error: Failed to decode image")
             return False  # no violation if image can't be processed
-        
-        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        with face_mesh_lock:
-            results = face_mesh.process(rgb)
-
-        if not results.multi_face_landmarks:
-            return False  # no face = no violation detected
 
-        return is_looking_away(results.multi_face_landmarks[0])
+        violation = _gaze_on_frame(img, session_id)
+        _store_payload(payload_hash, violation)
+        return violation
     except Exception as e:
         print(f"Error in analyze_gaze: {e}")
         return False
 
 
-def analyze_gaze_with_head_pose(base64_img: str) -> dict:
+def analyze_gaze_frame(img: np.ndarray, session_id: str = None) -> bool:
+    """
+    Looking-away check on an already decoded BGR frame. The frame is
+    overwritten during processing unless it is read-only.
+    """
+    try:
+        return _gaze_on_frame(_fit_frame(img, reuse_buffer=True), session_id)
+    except Exception as e:
+        print(f"Error in analyze_gaze_frame: {e}")
+        return False
+
+
+def _gaze_on_frame(img: np.ndarray, session_id) -> bool:
+    key = _session_key("gaze", session_id)
+    small = _thumbnail(img) if key is not None else None
+    cached = _cached_result(key, small)
+    if cached is not None:
+        return cached
+    
+    faces = _find_faces(img, in_place=img.flags.writeable)
+
+    if not faces:
+        violation = False  # no face = no violation detected
+    else:
+        violation = is_looking_away(faces[0])
+
+    _store_result(key, small, violation)
+    return violation
+
+
+def analyze_gaze_with_head_pose_bytes(img_bytes: bytes, session_id: str = None) -> dict:
     """
     Enhanced gaze analysis using head pose estimation.
     Returns a dict with violation status and direction info.
     """
     try:
-        img_bytes = base64.b64decode(base64_img)
-        image = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+        image = _decode_jpeg(img_bytes)
         
         if image is None or image.size == 0:
             return {"violation": False, "direction": "unknown", "error": "Failed to decode image"}
-        
-        image = cv2.flip(image, 1)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        with face_mesh_lock:
-            results = face_mesh.process(image_rgb)
-        
-        img_h, img_w, _ = image.shape
 
-        if not results.multi_face_landmarks:
-            return {"violation": False, "direction": "no_face", "yaw": 0, "pitch": 0}
-
-        for face_landmarks in results.multi_face_landmarks:
-            face_3d = []
-            face_2d = []
-
-            for idx, lm in enumerate(face_landmarks.landmark):
-                if idx in [33, 263, 1, 61, 291, 199]:
-                    x, y = int(lm.x * img_w), int(lm.y * img_h)
-                    face_2d.append([x, y])
-                    face_3d.append([x, y, lm.z])
-
-            face_2d = np.array(face_2d, dtype=np.float64)
-            face_3d = np.array(face_3d, dtype=np.float64)
-
-            focal_length = 1 * img_w
-            cam_matrix = np.array([
-                [focal_length, 0, img_h / 2],
-                [0, focal_length, img_w / 2],
-                [0, 0, 1]
-            ])
-            dist_matrix = np.zeros((4, 1), dtype=np.float64)
-
-            success, rot_vec, trans_vec = cv2.solvePnP(face_3d, face_2d, cam_matrix, dist_matrix)
-            rmat, _ = cv2.Rodrigues(rot_vec)
-            angles, _, _, _, _, _, _ = cv2.RQDecomp3x3(rmat)
-
-            x_angle = angles[0] * 360  # Pitch
-            y_angle = angles[1] * 360  # Yaw
-
-            direction = "focused"
-            violation = False
-
-            if y_angle < -YAW_THRESHOLD:
-                direction = "looking_left"
-                violation = True
-            elif y_angle > YAW_THRESHOLD:
-                direction = "looking_right"
-                violation = True
-            elif x_angle < -PITCH_THRESHOLD:
-                direction = "looking_down"
-                violation = True
-            elif x_angle > PITCH_THRESHOLD:
-                direction = "looking_up"
-                violation = True
-
-            return {
-                "violation": violation,
-                "direction": direction,
-                "yaw": round(y_angle, 2),
-                "pitch": round(x_angle, 2)
-            }
+        key = _session_key("head_pose", session_id)
+        small = _thumbnail(image) if key is not None else None
+        cached = _cached_result(key, small)
+        if cached is not None:
+            return cached
+
+        result = _head_pose(image)
+        _store_result(key, small, result)
+        return result
 
-        return {"violation": False, "direction": "focused", "yaw": 0, "pitch": 0}
-        
     except Exception as e:
         print(f"Error in analyze_gaze_with_head_pose: {e}")
         return {"violation": False, "direction": "error", "error": str(e)}
 
 
+# Eye outer corners and chin used for head pose
+POSE_LANDMARKS = (33, 263, 199)
+
+
+def _xyz(lm):
+    return lm.x, lm.y, lm.z
+
+
+@functools.lru_cache(maxsize=8)
+def _pixel_scale(img_w: int, img_h: int) -> np.ndarray:
+    """Normalized-to-pixel scale for (x, y, z); z shares x's scale."""
+    scale = np.array((img_w, img_h, img_w), dtype=np.float64)
+    scale.flags.writeable = False
+    return scale
+
+
+def _head_angles(landmarks, img_w: int, img_h: int):
+    """
+    Closed-form head pose: returns (pitch, yaw) in degrees.
+    Yaw is the depth tilt of the eye line, pitch the depth tilt of the
+    eye-to-chin line, less its frontal reading. Expects landmarks from an
+    unmirrored frame.
+    Negative yaw = turned to the subject's left, negative pitch = looking down.
+    """
+    # Index only the needed points instead of walking all 478 landmarks, and
+    # fill the array straight from a generator rather than a list of lists
+    points = np.fromiter(
+        (v for i in POSE_LANDMARKS for v in _xyz(landmarks[i])),
+        dtype=np.float64,
+        count=3 * len(POSE_LANDMARKS),
+    ).reshape(-1, 3)
+    points *= _pixel_scale(img_w, img_h)
+    right_eye, left_eye, chin = points
+
+    eye_axis = left_eye - right_eye
+    face_axis = chin - (left_eye + right_eye) * 0.5
+
+    # Landmarks come from the unmirrored frame, so point 33 is on the image
+    # left and a turn to the subject's left brings it towards the camera.
+    # A mirrored frame flips the sign; the old cv2.flip before solvePnP is
+    # already accounted for by the sign here, so frames must not be flipped
+    yaw = -np.degrees(np.arctan2(eye_axis[2], eye_axis[0]))
+    pitch = -np.degrees(np.arctan2(face_axis[2], face_axis[1])) - NEUTRAL_PITCH
+    return float(pitch), float(yaw)
+
+
+# Head pose directions, indexed by the direction id from _classify
+DIRECTIONS = ("focused", "looking_left", "looking_right", "looking_down", "looking_up")
+# Annotation text and BGR colour, indexed by [violation][direction id]
+_DIRECTION_TEXT = (
+    ("Focused",) * len(DIRECTIONS),
+    ("", "WARNING: Looking Left!", "WARNING: Looking Right!",
+     "WARNING: Looking Down!", "WARNING: Looking Up!"),
+)
+_TEXT_COLOR = ((0, 255, 0), (0, 0, 255))
+
+
+def _classify(yaw, pitch, yaw_threshold, pitch_threshold):
+    """Returns (violation, direction id) for a head pose in degrees."""
+    if yaw < -yaw_threshold:
+        return True, 1
+    if yaw > yaw_threshold:
+        return True, 2
+    if pitch < -pitch_threshold:
+        return True, 3
+    if pitch > pitch_threshold:
+        return True, 4
+    return False, 0
+
+
+def _head_pose(image: np.ndarray) -> dict:
+    """Run FaceMesh + head pose on a decoded BGR frame (converted to RGB in place)."""
+    faces = _find_faces(image, in_place=True, refine=False)
+    
+    img_h, img_w, _ = image.shape
+
+    if not faces:
+        return {"violation": False, "direction": "no_face", "yaw": 0, "pitch": 0}
+
+    for face_landmarks in faces:
+        x_angle, y_angle = _head_angles(face_landmarks, img_w, img_h)
+
+        violation, direction_id = _classify(y_angle, x_angle, YAW_THRESHOLD, PITCH_THRESHOLD)
+
+        return {
+            "violation": violation,
+            "direction": DIRECTIONS[direction_id],
+            "yaw": round(y_angle, 2),
+            "pitch": round(x_angle, 2)
+        }
+
+    return {"violation": False, "direction": "focused", "yaw": 0, "pitch": 0}
+
+
+# Gaze worker processes per server process (up to 4), sharing the cores with
+# the other uvicorn workers (WEB_CONCURRENCY) rather than each taking 4
+BATCH_WORKERS = int(
+    os.environ.get("GAZE_BATCH_WORKERS")
+    or max(min(4, (os.cpu_count() or 4) // _SERVER_WORKERS), 1)
+)
+
+# One single-process executor per worker, so a session can be pinned to one
+# process: its frame cache lives in that process's memory
+_worker_pools = None
+_worker_pool_lock = threading.Lock()
+_next_worker = itertools.count()
+
+
+def get_worker_pool(session_id=None) -> ProcessPoolExecutor:
+    """
+    Worker process for session_id's frames (GAZE_PROCESS_POOL): the same one
+    for every frame of a session, any one without a session_id (batches).
+    Each worker loads its own landmark models.
+    """
+    global _worker_pools
+    with _worker_pool_lock:
+        if _worker_pools is None:
+            _worker_pools = [
+                # spawn, not fork: MediaPipe's threads don't survive a fork
+                ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    # Parallelism comes from the workers; keep OpenCV to one
+                    # thread in each
+                    initializer=cv2.setNumThreads,
+                    initargs=(1,),
+                )
+                for _ in range(BATCH_WORKERS)
+            ]
+        pools = _worker_pools
+    if session_id is None:
+        return pools[next(_next_worker) % len(pools)]
+    return pools[hash(session_id) % len(pools)]
+
+
+def shutdown_worker_pool():
+    global _worker_pools
+    with _worker_pool_lock:
+        if _worker_pools is not None:
+            for pool in _worker_pools:
+                pool.shutdown(cancel_futures=True)
+            _worker_pools = None
+
+
+def _head_pose_shared(shm_name: str, offset: int, img_h: int, img_w: int) -> dict:
+    """Worker side of submit_gaze_batch: head pose on a frame in shared memory."""
+    shm = SharedMemory(name=shm_name)
+    image = None
+    try:
+        image = np.ndarray((img_h, img_w, 3), dtype=np.uint8, buffer=shm.buf, offset=offset)
+        return _head_pose(image)
+    except Exception as e:
+        print(f"Error in submit_gaze_batch worker: {e}")
+        return {"violation": False, "direction": "error", "error": str(e)}
+    finally:
+        del image  # the view must go before the segment is closed
+        shm.close()
+
+
+def _release_when_done(shm: SharedMemory, futures: list):
+    """Close and unlink shm once every future reading from it has finished."""
+    if not futures:
+        shm.close()
+        shm.unlink()
+        return
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            shm.close()
+            shm.unlink()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+def submit_gaze_batch(frames: list) -> list:
+    """
+    Head pose analysis for a list of (img_bytes, session_id) JPEG frames.
+    Frames are decoded here, packed into one shared memory segment and
+    fanned out over the worker processes by (segment, offset, h, w).
+    Returns one entry per frame, in order: the result dict for frames that
+    failed to decode, a Future of it for the rest. Nothing here waits on the
+    workers, so the caller can await the futures without holding a thread.
+    """
+    results = [None] * len(frames)
+    images = []
+    for i, (img_bytes, _) in enumerate(frames):
+        # All frames are held at once, so they can't share the scratch buffer
+        image = _decode_jpeg(img_bytes, reuse_buffer=False)
+        if image is None or image.size == 0:
+            results[i] = {"violation": False, "direction": "unknown", "error": "Failed to decode image"}
+        else:
+            images.append((i, image))
+
+    if not images:
+        return results
+
+    shm = SharedMemory(create=True, size=sum(image.nbytes for _, image in images))
+    futures = []
+    try:
+        offset = 0
+        for i, image in images:
+            img_h, img_w = image.shape[:2]
+            dst = np.ndarray(image.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            dst[:] = image
+            del dst
+            results[i] = get_worker_pool().submit(
+                _head_pose_shared, shm.name, offset, img_h, img_w
+            )
+            futures.append(results[i])
+            offset += image.nbytes
+    finally:
+        # The segment outlives this call; the last worker to finish frees it
+        _release_when_done(shm, futures)
+
+    return results
+
+    shm = SharedMemory(create=True, size=sum(image.nbytes for _, image in images))
+    try:
+        futures = []
+        offset = 0
+        for i, image in images:
+            img_h, img_w = image.shape[:2]
+            dst = np.ndarray(image.shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            dst[:] = image
+            del dst
+            futures.append((i, get_worker_pool().submit(
+                _head_pose_shared, shm.name, offset, img_h, img_w
+            )))
+            offset += image.nbytes
+
+        for i, future in futures:
+            results[i] = future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+def annotate_frame(image: np.ndarray, result: dict) -> np.ndarray:
+    """Mirror a monitor frame for display and draw result's verdict on it, in place."""
+    cv2.flip(image, 1, dst=image)
+    direction = result.get("direction")
+    if direction in DIRECTIONS:
+        violation = bool(result["violation"])
+        cv2.putText(image, _DIRECTION_TEXT[violation][DIRECTIONS.index(direction)], (20, 50),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, _TEXT_COLOR[violation], 2)
+    return image
+
+
 def process_frame_cv2(image: np.ndarray) -> dict:
     """
     Process a CV2 image frame directly (for standalone monitoring mode).
     Returns dict with violation status, direction, and annotated image.
+    The frame is mirrored and annotated in place.
     """
     try:
-        image = cv2.flip(image, 1)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        with face_mesh_lock:
-            results = face_mesh.process(image_rgb)
-        
+        faces = _find_faces(image, refine=False, track=True)
         img_h, img_w, _ = image.shape
 
-        if not results.multi_face_landmarks:
-            return {
+        if not faces:
+            result = {
                 "violation": False,
                 "direction": "no_face",
-                "image": image,
                 "yaw": 0,
                 "pitch": 0
             }
-
-        for face_landmarks in results.multi_face_landmarks:
-            face_3d = []
-            face_2d = []
-
-            for idx, lm in enumerate(face_landmarks.landmark):
-                if idx in [33, 263, 1, 61, 291, 199]:
-                    x, y = int(lm.x * img_w), int(lm.y * img_h)
-                    face_2d.append([x, y])
-                    face_3d.append([x, y, lm.z])
-
-            face_2d = np.array(face_2d, dtype=np.float64)
-            face_3d = np.array(face_3d, dtype=np.float64)
-
-            focal_length = 1 * img_w
-            cam_matrix = np.array([
-                [focal_length, 0, img_h / 2],
-                [0, focal_length, img_w / 2],
-                [0, 0, 1]
-            ])
-            dist_matrix = np.zeros((4, 1), dtype=np.float64)
-
-            success, rot_vec, trans_vec = cv2.solvePnP(face_3d, face_2d, cam_matrix, dist_matrix)
-            rmat, _ = cv2.Rodrigues(rot_vec)
-            angles, _, _, _, _, _, _ = cv2.RQDecomp3x3(rmat)
-
-            x_angle = angles[0] * 360  # Pitch
-            y_angle = angles[1] * 360  # Yaw
-
-            direction = "focused"
-            violation = False
-            text = "Focused"
-
-            if y_angle < -YAW_THRESHOLD:
-                direction = "looking_left"
-                violation = True
-                text = "Looking Left!"
-            elif y_angle > YAW_THRESHOLD:
-                direction = "looking_right"
-                violation = True
-                text = "Looking Right!"
-            elif x_angle < -PITCH_THRESHOLD:
-                direction = "looking_down"
-                violation = True
-                text = "Looking Down!"
-            elif x_angle > PITCH_THRESHOLD:
-                direction = "looking_up"
-                violation = True
-                text = "Looking Up!"
-
-            # Annotate image
-            if violation:
-                cv2.putText(image, "WARNING: " + text, (20, 50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            else:
-                cv2.putText(image, text, (20, 50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-            return {
+        else:
+            x_angle, y_angle = _head_angles(faces[0], img_w, img_h)
+            violation, direction_id = _classify(y_angle, x_angle, YAW_THRESHOLD, PITCH_THRESHOLD)
+            result = {
                 "violation": violation,
-                "direction": direction,
-                "image": image,
+                "direction": DIRECTIONS[direction_id],
                 "yaw": round(y_angle, 2),
                 "pitch": round(x_angle, 2)
             }
 
-        return {
-            "violation": False,
-            "direction": "focused",
-            "image": image,
-            "yaw": 0,
-            "pitch": 0
-        }
+        # Mirroring is only for display; the angles come from the landmarks
+        result["image"] = annotate_frame(image, result)
+        return result
         
     except Exception as e:
         print(f"Error in process_frame_cv2: {e}")
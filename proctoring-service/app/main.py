@@ -1,21 +1,56 @@
-from fastapi import FastAPI
+import os
+# Concurrency model: requests run in parallel on the inference threadpool
+# (one thread per core, see INFERENCE_THREADS), so native code stays
+# single-threaded within a request instead of every OpenMP/OpenCV pool
+# spinning up a thread per core on top of it. Must be set before numpy and
+# cv2 load.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import base64
+from typing import List, NamedTuple, Optional
+import anyio
+import asyncio
+from concurrent.futures import Future
 import numpy as np
 import cv2
 import time
 import sys
-import os
-from gaze import analyze_gaze, analyze_gaze_with_head_pose, process_frame_cv2
+import queue
+import threading
+import psutil
+from gaze import (
+    analyze_gaze_bytes,
+    analyze_gaze_frame,
+    analyze_gaze_with_head_pose_bytes,
+    submit_gaze_batch,
+    process_frame_cv2,
+    annotate_frame,
+    get_worker_pool,
+    shutdown_worker_pool,
+    close_frame_models
+)
 from utils import (
     get_active_window_pid, 
     get_active_window, 
     kill_process_by_pid, 
     activate_window,
+    get_foreground_hwnd,
+    get_window_pid,
+    list_visible_windows,
+    start_foreground_watcher,
     WINDOWS_AVAILABLE
 )
 
+# Only needed by the /window endpoints, which check WINDOWS_AVAILABLE first
+try:
+    import pygetwindow as gw
+except ImportError:
+    gw = None
+
+cv2.setNumThreads(1)
+
 app = FastAPI()
 
 # Add CORS middleware
@@ -32,22 +67,98 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-class FramePayload(BaseModel):
-    image: str
+# Gaze endpoints parse their JSON bodies directly instead of through
+# pydantic: msgspec when available, else json plus a type check. Either way
+# image arrives as the base64 JPEG and comes out as its bytes; msgspec
+# decodes the base64 while parsing, without a str copy of it in between.
+try:
+    import msgspec
+
+    class FramePayload(msgspec.Struct):
+        image: bytes
+        session_id: Optional[str] = None  # without one, frames skip the per-client caches
+
+    _parse_frame = msgspec.json.Decoder(FramePayload).decode
+    _parse_frames = msgspec.json.Decoder(List[FramePayload]).decode
+    _PAYLOAD_ERRORS = msgspec.DecodeError
+except ImportError:
+    import json
+    # SIMD base64 decoding when available; the stdlib module has the same API
+    try:
+        import pybase64 as base64
+    except ImportError:
+        import base64
+
+    class FramePayload(NamedTuple):
+        image: bytes
+        session_id: Optional[str] = None  # without one, frames skip the per-client caches
+
+    def _frame_from_json(data):
+        if not isinstance(data, dict) or not isinstance(data.get("image"), str):
+            raise ValueError("Expected an object with a string 'image'")
+        session_id = data.get("session_id")
+        if session_id is not None and not isinstance(session_id, str):
+            raise ValueError("'session_id' must be a string")
+        return FramePayload(base64.b64decode(data["image"], validate=False), session_id)
+
+    def _parse_frame(body):
+        return _frame_from_json(json.loads(body))
+
+    def _parse_frames(body):
+        data = json.loads(body)
+        if not isinstance(data, list):
+            raise ValueError("Expected an array of frames")
+        return [_frame_from_json(item) for item in data]
+
+    _PAYLOAD_ERRORS = ValueError  # binascii.Error included
+
+
+async def read_payload(request: Request, parse):
+    """Parse a gaze request body with parse; malformed bodies get a 422, like pydantic's."""
+    try:
+        return parse(await request.body())
+    except _PAYLOAD_ERRORS as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 class WindowCheckPayload(BaseModel):
     allowed_window_title: str = None
 
-def decode_base64_image(b64):
-    img_bytes = base64.b64decode(b64)
-    np_arr = np.frombuffer(img_bytes, np.uint8)
-    frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-    return frame
+# Inference is CPU-bound: more threads than cores only adds contention.
+# The cores are shared between the uvicorn worker processes
+# (WEB_CONCURRENCY, as uvicorn reads it), each with its own threadpool.
+SERVER_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+INFERENCE_THREADS = max((os.cpu_count() or 4) // SERVER_WORKERS, 1)
+# GAZE_PROCESS_POOL=1 runs single-frame inference in the worker processes
+# (as batches do) instead of the threadpool
+USE_PROCESS_POOL = os.environ.get("GAZE_PROCESS_POOL") == "1"
+
+
+@app.on_event("startup")
+def startup():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = INFERENCE_THREADS
+    if USE_PROCESS_POOL:
+        get_worker_pool()
+    start_foreground_watcher()
+
+
+async def run_inference(func, frame, session_id):
+    """
+    Run CPU-bound gaze analysis off the event loop. In the process pool a
+    session always goes to the same worker, which holds its cached state.
+    """
+    if USE_PROCESS_POOL:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_worker_pool(session_id), func, frame, session_id
+        )
+    return await anyio.to_thread.run_sync(func, frame, session_id)
+
 
 @app.post("/verify-gaze")
-def verify_gaze(payload: FramePayload):
+async def verify_gaze(request: Request):
+    payload = await read_payload(request, _parse_frame)
     try:
-        violation = analyze_gaze(payload.image)
+        violation = await run_inference(analyze_gaze_bytes, payload.image, payload.session_id)
         return {
             "violation": violation,
             "looking_away": violation
@@ -60,10 +171,13 @@ def verify_gaze(payload: FramePayload):
         }
 
 @app.post("/verify-gaze-enhanced")
-def verify_gaze_enhanced(payload: FramePayload):
+async def verify_gaze_enhanced(request: Request):
     """Enhanced gaze verification with head pose estimation."""
+    payload = await read_payload(request, _parse_frame)
     try:
-        result = analyze_gaze_with_head_pose(payload.image)
+        result = await run_inference(
+            analyze_gaze_with_head_pose_bytes, payload.image, payload.session_id
+        )
         return result
     except Exception as e:
         print(f"Error in verify_gaze_enhanced: {e}")
@@ -74,8 +188,102 @@ def verify_gaze_enhanced(payload: FramePayload):
         }
 
 
+@app.post("/verify-gaze-raw")
+async def verify_gaze_raw(request: Request, session_id: str = None):
+    """Same as /verify-gaze, but the body is the JPEG itself (Content-Type: image/jpeg)."""
+    try:
+        body = await request.body()
+        violation = await run_inference(analyze_gaze_bytes, body, session_id)
+        return {
+            "violation": violation,
+            "looking_away": violation
+        }
+    except Exception as e:
+        print(f"Error in verify_gaze_raw: {e}")
+        return {
+            "violation": False,
+            "looking_away": False
+        }
+
+
+@app.post("/verify-gaze-rgb")
+async def verify_gaze_rgb(request: Request, session_id: str = None):
+    """
+    Same as /verify-gaze-raw, but the body is the uncompressed frame: packed
+    BGR uint8 pixels, with the size in X-Width / X-Height. For same-host
+    clients, where skipping the JPEG encode/decode beats the larger upload.
+    """
+    try:
+        width = int(request.headers["x-width"])
+        height = int(request.headers["x-height"])
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=422, detail="X-Width and X-Height must be integers")
+    body = await request.body()
+    if width <= 0 or height <= 0 or len(body) != width * height * 3:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Body is {len(body)} bytes, expected {width}x{height}x3 BGR pixels"
+        )
+    image = np.frombuffer(body, dtype=np.uint8).reshape(height, width, 3)
+    try:
+        violation = await run_inference(analyze_gaze_frame, image, session_id)
+        return {
+            "violation": violation,
+            "looking_away": violation
+        }
+    except Exception as e:
+        print(f"Error in verify_gaze_rgb: {e}")
+        return {
+            "violation": False,
+            "looking_away": False
+        }
+
+
+@app.post("/verify-gaze-enhanced-raw")
+async def verify_gaze_enhanced_raw(request: Request, session_id: str = None):
+    """Same as /verify-gaze-enhanced, but the body is the JPEG itself."""
+    try:
+        body = await request.body()
+        return await run_inference(analyze_gaze_with_head_pose_bytes, body, session_id)
+    except Exception as e:
+        print(f"Error in verify_gaze_enhanced_raw: {e}")
+        return {
+            "violation": False,
+            "direction": "error",
+            "error": str(e)
+        }
+
+
+@app.post("/verify-gaze-batch")
+async def verify_gaze_batch(request: Request):
+    """Head pose verification for several frames at once, spread over worker processes."""
+    payloads = await read_payload(request, _parse_frames)
+    try:
+        # Only decoding takes a threadpool slot; the wait for the worker
+        # processes happens here on the event loop
+        results = await anyio.to_thread.run_sync(
+            submit_gaze_batch, [(p.image, p.session_id) for p in payloads]
+        )
+        return [
+            await asyncio.wrap_future(result) if isinstance(result, Future) else result
+            for result in results
+        ]
+    except Exception as e:
+        print(f"Error in verify_gaze_batch: {e}")
+        return [
+            {"violation": False, "direction": "error", "error": str(e)}
+            for _ in payloads
+        ]
+
+
+@app.on_event("shutdown")
+def shutdown():
+    shutdown_worker_pool()
+    close_frame_models()
+
+
 # Store the allowed window title for monitoring
-allowed_window_store = {"title": None, "pid": None}
+allowed_window_store = {"title": None, "pid": None, "hwnd": None}
 
 @app.post("/window/set-allowed")
 def set_allowed_window():
@@ -88,14 +296,19 @@ def set_allowed_window():
         }
     
     try:
-        window = get_active_window()
-        pid = get_active_window_pid()
+        # Read the foreground HWND once so title, PID and HWND all describe
+        # the same window
+        hwnd = get_foreground_hwnd()
         
-        if window is None:
+        if not hwnd:
             return {"success": False, "error": "Could not detect active window"}
         
+        window = gw.Win32Window(hwnd)
+        pid = get_window_pid(hwnd)
+        
         allowed_window_store["title"] = window.title
         allowed_window_store["pid"] = pid
+        allowed_window_store["hwnd"] = hwnd
         
         return {
             "success": True,
@@ -125,8 +338,20 @@ def check_window():
         }
     
     try:
+        # Same foreground HWND as the allowed window: nothing else to look up
+        if get_foreground_hwnd() == allowed_window_store["hwnd"]:
+            return {
+                "violation": False,
+                "current_window": allowed_window_store["title"],
+                "current_pid": allowed_window_store["pid"],
+                "allowed_window": allowed_window_store["title"],
+                "allowed_pid": allowed_window_store["pid"],
+                "windows_available": True
+            }
+
         current_window = get_active_window()
-        current_pid = get_active_window_pid()
+        # Read-only check, so the HWND cache is fine here
+        current_pid = get_active_window_pid(cached=True)
         
         if current_window is None:
             return {
@@ -173,9 +398,28 @@ def reset_window_monitoring():
     """Reset the allowed window (stop monitoring)."""
     allowed_window_store["title"] = None
     allowed_window_store["pid"] = None
+    allowed_window_store["hwnd"] = None
     return {"success": True, "message": "Window monitoring reset"}
 
 
+# System processes that should never be closed
+_PROTECTED = frozenset({
+    'explorer.exe', 'dwm.exe', 'csrss.exe', 'wininit.exe', 
+    'services.exe', 'lsass.exe', 'smss.exe', 'svchost.exe',
+    'system', 'registry', 'taskhostw.exe', 'sihost.exe',
+    'fontdrvhost.exe', 'winlogon.exe', 'ctfmon.exe',
+    'runtimebroker.exe', 'searchui.exe', 'shellexperiencehost.exe',
+    'startmenuexperiencehost.exe', 'textinputhost.exe',
+    'applicationframehost.exe', 'systemsettings.exe',
+    'securityhealthsystray.exe', 'securityhealthservice.exe',
+    'conhost.exe', 'cmd.exe', 'powershell.exe', 'python.exe',
+    'pythonw.exe', 'uvicorn.exe', 'node.exe', 'code.exe'
+})
+
+# The proctoring service's own process, never closed
+_OWN_PID = os.getpid()
+
+
 @app.post("/window/close-others")
 def close_other_windows():
     """
@@ -197,72 +441,56 @@ def close_other_windows():
         }
     
     try:
-        import psutil
-        
         closed_apps = []
         skipped_apps = []
         failed_apps = []
         
-        # Get list of all visible windows
-        all_windows = gw.getAllWindows()
+        # (hwnd, title, pid) of all visible windows, from one EnumWindows pass
+        all_windows = list_visible_windows()
         
-        # System processes that should never be closed
-        protected_processes = [
-            'explorer.exe', 'dwm.exe', 'csrss.exe', 'wininit.exe', 
-            'services.exe', 'lsass.exe', 'smss.exe', 'svchost.exe',
-            'system', 'registry', 'taskhostw.exe', 'sihost.exe',
-            'fontdrvhost.exe', 'winlogon.exe', 'ctfmon.exe',
-            'runtimebroker.exe', 'searchui.exe', 'shellexperiencehost.exe',
-            'startmenuexperiencehost.exe', 'textinputhost.exe',
-            'applicationframehost.exe', 'systemsettings.exe',
-            'securityhealthsystray.exe', 'securityhealthservice.exe',
-            'conhost.exe', 'cmd.exe', 'powershell.exe', 'python.exe',
-            'pythonw.exe', 'uvicorn.exe', 'node.exe', 'code.exe'
-        ]
+        # One pass over the process table instead of opening each window's
+        # process separately
+        process_names = {
+            p.info['pid']: (p.info['name'] or '').lower()
+            for p in psutil.process_iter(['pid', 'name'])
+        }
         
-        for window in all_windows:
-            if not window.title or window.title.strip() == '':
-                continue
-                
+        for _, title, window_pid in all_windows:
             try:
-                # Get the process ID for this window
-                hwnd = window._hWnd
-                _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                
                 # Skip the allowed window (the test browser)
                 if window_pid == allowed_window_store["pid"]:
                     skipped_apps.append({
-                        "title": window.title,
+                        "title": title,
                         "reason": "allowed_window"
                     })
                     continue
                 
-                # Get process info
+                process_name = process_names.get(window_pid)
+                if process_name is None:
+                    continue  # exited since the process table was read
+
                 try:
-                    process = psutil.Process(window_pid)
-                    process_name = process.name().lower()
-                    
                     # Skip protected system processes
-                    if process_name in protected_processes:
+                    if process_name in _PROTECTED:
                         skipped_apps.append({
-                            "title": window.title,
+                            "title": title,
                             "process": process_name,
                             "reason": "protected_process"
                         })
                         continue
                     
                     # Skip the current Python process (proctoring service)
-                    if window_pid == os.getpid():
+                    if window_pid == _OWN_PID:
                         skipped_apps.append({
-                            "title": window.title,
+                            "title": title,
                             "reason": "proctoring_service"
                         })
                         continue
                     
                     # Terminate the process
-                    process.terminate()
+                    psutil.Process(window_pid).terminate()
                     closed_apps.append({
-                        "title": window.title,
+                        "title": title,
                         "process": process_name,
                         "pid": window_pid
                     })
@@ -271,13 +499,13 @@ def close_other_windows():
                     pass
                 except psutil.AccessDenied:
                     failed_apps.append({
-                        "title": window.title,
+                        "title": title,
                         "reason": "access_denied"
                     })
                     
             except Exception as e:
                 failed_apps.append({
-                    "title": window.title,
+                    "title": title,
                     "reason": str(e)
                 })
         
@@ -307,33 +535,21 @@ def list_windows():
         }
     
     try:
-        import psutil
-        
-        all_windows = gw.getAllWindows()
         window_list = []
         
-        for window in all_windows:
-            if not window.title or window.title.strip() == '':
-                continue
-            
+        for _, title, window_pid in list_visible_windows():
             try:
-                hwnd = window._hWnd
-                _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                
-                try:
-                    process = psutil.Process(window_pid)
-                    process_name = process.name()
-                except:
-                    process_name = "unknown"
-                
-                window_list.append({
-                    "title": window.title,
-                    "pid": window_pid,
-                    "process": process_name,
-                    "is_allowed": window_pid == allowed_window_store.get("pid")
-                })
+                process = psutil.Process(window_pid)
+                process_name = process.name()
             except:
-                pass
+                process_name = "unknown"
+            
+            window_list.append({
+                "title": title,
+                "pid": window_pid,
+                "process": process_name,
+                "is_allowed": window_pid == allowed_window_store.get("pid")
+            })
         
         return {
             "success": True,
@@ -348,6 +564,66 @@ def list_windows():
         }
 
 
+def open_camera(index=0):
+    """
+    Open the webcam for the standalone monitor: DirectShow with MJPG at
+    640x480 (avoids CPU-side YUY2 conversion) and a one-frame driver buffer.
+    """
+    cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def capture_latest(cap, frames, stop):
+    """Read frames continuously, keeping only the newest one in the frames queue."""
+    while not stop.is_set() and cap.isOpened():
+        success, image = cap.read()
+        if not success:
+            time.sleep(0.01)
+            continue
+        try:
+            frames.put_nowait(image)
+        except queue.Full:
+            # Drop the stale frame; this is the only producer, so the slot
+            # is free again once it's taken out
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+            frames.put_nowait(image)
+
+
+# How often the standalone monitor checks the foreground window (~30 Hz)
+WINDOW_CHECK_INTERVAL = 1 / 30
+# Run gaze detection on every Nth camera frame (~10 Hz at 30 fps); frames in
+# between are shown with the last verdict
+GAZE_EVERY_N_FRAMES = 3
+
+
+def enforce_allowed_window(allowed_window, allowed_title, allowed_pid, stop):
+    """Kill whatever takes the foreground from the allowed window, until stop is set."""
+    allowed_hwnd = allowed_window._hWnd
+    while not stop.is_set():
+        # Allowed window still in front: skip the window and PID lookups
+        if get_foreground_hwnd() == allowed_hwnd:
+            stop.wait(WINDOW_CHECK_INTERVAL)
+            continue
+
+        current_window = get_active_window()
+        current_pid = get_active_window_pid()
+
+        if current_pid is not None and current_pid != allowed_pid:
+            if current_window is not None and current_window.title != allowed_title:
+                print(f"⚠️ CHEATING ATTEMPT: User switched to '{current_window.title}'")
+                kill_process_by_pid(current_pid)
+                activate_window(allowed_window)
+
+        stop.wait(WINDOW_CHECK_INTERVAL)
+
+
 def start_monitoring():
     """
     Standalone monitoring mode with window tracking and gaze detection.
@@ -357,7 +633,7 @@ def start_monitoring():
         print("❌ ERROR: Windows-specific modules not available. This feature only works on Windows.")
         return
     
-    cap = cv2.VideoCapture(0)
+    cap = open_camera()
     
     if not cap.isOpened():
         print("❌ ERROR: Could not open camera.")
@@ -391,30 +667,47 @@ def start_monitoring():
         return
 
     violation_count = 0
+    start_foreground_watcher()
+
+    # Pipeline: capture and window enforcement run in their own threads, so
+    # the loop below only does inference and display on the latest frame and
+    # neither capture nor window checks wait for inference
+    frames = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_latest, args=(cap, frames, stop), daemon=True
+    )
+    window_thread = threading.Thread(
+        target=enforce_allowed_window,
+        args=(allowed_window, allowed_title, allowed_pid, stop),
+        daemon=True
+    )
+    capture_thread.start()
+    window_thread.start()
     
-    while cap.isOpened():
-        success, image = cap.read()
-        if not success:
-            continue
-
-        # Window monitoring
-        current_window = get_active_window()
-        current_pid = get_active_window_pid()
+    frame_idx = 0
+    last_result = None
 
-        if current_pid is not None and current_pid != allowed_pid:
-            if current_window is not None and current_window.title != allowed_title:
-                print(f"⚠️ CHEATING ATTEMPT: User switched to '{current_window.title}'")
-                kill_process_by_pid(current_pid)
-                activate_window(allowed_window)
+    while capture_thread.is_alive():
+        try:
+            image = frames.get(timeout=1)
+        except queue.Empty:
+            continue
 
-        # Gaze detection with head pose estimation
-        result = process_frame_cv2(image)
-        annotated_image = result.get("image", image)
-        
-        if result.get("violation", False):
+        if last_result is None or frame_idx % GAZE_EVERY_N_FRAMES == 0:
+            # Gaze detection with head pose estimation
+            last_result = process_frame_cv2(image)
+            annotated_image = last_result.get("image", image)
+        else:
+            annotated_image = annotate_frame(image, last_result)
+        frame_idx += 1
+
+        # Counted per captured frame, skipped ones included (they carry the
+        # last verdict), so the total means the same as without frame skipping
+        if last_result.get("violation", False):
             violation_count += 1
             if violation_count % 30 == 0:  # Log every ~1 second at 30fps
-                print(f"⚠️ GAZE VIOLATION: {result.get('direction', 'unknown')}")
+                print(f"⚠️ GAZE VIOLATION: {last_result.get('direction', 'unknown')}")
 
         cv2.imshow('Proctor Monitor (Press Q to quit)', annotated_image)
 
@@ -422,21 +715,58 @@ def start_monitoring():
             break
 
     print(f"\n📊 Session ended. Total gaze violations detected: {violation_count}")
+    stop.set()
+    capture_thread.join(timeout=1)
+    window_thread.join(timeout=1)
     cap.release()
     cv2.destroyAllWindows()
 
 
+def serve(host="0.0.0.0", port=8000):
+    """
+    Production server on uvloop/httptools. One worker process unless
+    WEB_CONCURRENCY says otherwise; the inference threadpool and the gaze
+    worker processes are sized per worker, so together they stay around the
+    core count.
+
+    All session state is per process: the frame caches,
+    allowed_window_store and the monitor's state. With several
+    workers a client's requests land on any of them, so caching works less
+    well and the /window/* endpoints stop working reliably; only raise
+    WEB_CONCURRENCY for gaze-only deployments.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        workers=SERVER_WORKERS,
+        # uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--monitor":
         # Run standalone monitoring mode
         start_monitoring()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve()
     else:
         # Default: print help
         print("Proctoring Service")
         print("==================")
         print("\nUsage:")
         print("  python main.py --monitor    : Run standalone monitoring mode (Windows only)")
-        print("  uvicorn main:app --reload   : Run as FastAPI server")
+        print("  python main.py --serve      : Run as FastAPI server (WEB_CONCURRENCY=N workers,")
+        print("                                gaze endpoints only: session state is per worker)")
+        print("  uvicorn main:app --reload   : Run as FastAPI server (development)")
         print("\nAPI Endpoints (when running as server):")
         print("  POST /verify-gaze           : Basic gaze verification")
         print("  POST /verify-gaze-enhanced  : Enhanced gaze with head pose estimation")
+        print("  POST /verify-gaze-raw       : /verify-gaze with a raw image/jpeg body")
+        print("  POST /verify-gaze-rgb       : /verify-gaze with a raw BGR body (X-Width/X-Height)")
+        print("  POST /verify-gaze-enhanced-raw : /verify-gaze-enhanced with a raw image/jpeg body")
+        print("  POST /verify-gaze-batch     : Head pose for a list of frames (multi-process)")
@@ -1,8 +1,10 @@
-import math
+import threading
 import psutil
 
 # Try to import Windows-specific modules
 try:
+    import ctypes
+    from ctypes import wintypes
     import pygetwindow as gw
     import win32process  # type: ignore
     import win32gui  # type: ignore
@@ -10,38 +12,141 @@ try:
 except ImportError:
     WINDOWS_AVAILABLE = False
 
-LEFT_EYE = [33, 133]
-RIGHT_EYE = [362, 263]
+# Landmark indices (image-left eye is the subject's right eye)
+LEFT_EYE_OUTER = 33
+LEFT_EYE_INNER = 133
+RIGHT_EYE_INNER = 362
+RIGHT_EYE_OUTER = 263
 NOSE = 1
 
-# Head pose thresholds
-YAW_THRESHOLD = 20
-PITCH_THRESHOLD = 15
+# Head pose thresholds, in degrees from a frontal pose. These match where the
+# old solvePnP readings (20 / 15 in its own units) fired: ~30 deg of yaw and
+# ~20-25 deg of pitch
+YAW_THRESHOLD = 30
+PITCH_THRESHOLD = 20
 
-def distance(a, b):
-    return math.sqrt((a.x - b.x)**2 + (a.y - b.y)**2)
+# Pitch the closed-form pose reads for a frontal face: the chin sits closer to
+# the camera (smaller z) than the eye corners, which reads as tilted up
+# (measured 2-9 deg, ~5 on average); subtracted so a frontal face reads ~0
+NEUTRAL_PITCH = 5.0
+
+# Max horizontal nose offset from the eye midpoint (normalized image width)
+# before the candidate counts as looking away
+LOOKING_AWAY_THRESHOLD = 0.016
 
 def is_looking_away(landmarks) -> bool:
-    left = landmarks.landmark[LEFT_EYE[0]]
-    right = landmarks.landmark[RIGHT_EYE[1]]
-    nose = landmarks.landmark[NOSE]
+    # Only three landmarks matter, so read just their x coordinates rather
+    # than converting the whole landmark list
+    left_x = landmarks[LEFT_EYE_OUTER].x
+    right_x = landmarks[RIGHT_EYE_OUTER].x
+    nose_x = landmarks[NOSE].x
+
+    return abs(nose_x - (left_x + right_x) * 0.5) > LOOKING_AWAY_THRESHOLD
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+# Foreground window handle as last reported by the WinEvent hook
+# (None until the hook is installed)
+_foreground = {"hwnd": None}
+_foreground_watcher = None
+
+def _watch_foreground():
+    """Install a foreground-change hook and pump messages for it (runs in its own thread)."""
+    user32 = ctypes.windll.user32
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+
+    def on_foreground(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        _foreground["hwnd"] = hwnd or 0
+
+    callback = WinEventProc(on_foreground)  # must stay referenced while hooked
+    hook = user32.SetWinEventHook(
+        EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+        0, callback, 0, 0, WINEVENT_OUTOFCONTEXT
+    )
+    if not hook:
+        print("⚠️ Could not install foreground window hook, falling back to polling")
+        return
+
+    _foreground["hwnd"] = user32.GetForegroundWindow()
+    msg = wintypes.MSG()
+    while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+        user32.TranslateMessage(ctypes.byref(msg))
+        user32.DispatchMessageW(ctypes.byref(msg))
+    user32.UnhookWinEvent(hook)
 
-    eye_mid_x = (left.x + right.x) / 2
+def start_foreground_watcher():
+    """Start tracking the foreground window from WinEvent callbacks instead of polling."""
+    global _foreground_watcher
+    if not WINDOWS_AVAILABLE or _foreground_watcher is not None:
+        return
+    _foreground_watcher = threading.Thread(
+        target=_watch_foreground, name="foreground-watcher", daemon=True
+    )
+    _foreground_watcher.start()
 
-    # Increased threshold from 0.015 to 0.025 for less sensitivity
-    if abs(nose.x - eye_mid_x) > 0.016:
+def get_foreground_hwnd():
+    """Returns the foreground window handle, from the hook's cache when available."""
+    hwnd = _foreground["hwnd"]
+    if hwnd is None:
+        hwnd = win32gui.GetForegroundWindow()
+    return hwnd
+
+# hwnd -> owning PID, for read-only checks polled at a high rate. Only a new
+# foreground HWND costs a GetWindowThreadProcessId call. Windows reuses HWNDs,
+# so an entry can go stale: anything that terminates processes must use the
+# uncached get_window_pid. Titles change (browser tabs), so those are always
+# read fresh.
+_HWND_PIDS_MAX = 256
+_hwnd_pids = {}
+
+def get_window_pid(hwnd):
+    """Returns the PID owning the given window handle."""
+    _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    return pid
+
+def get_cached_window_pid(hwnd):
+    """get_window_pid through the HWND cache; may be stale, so never use it to pick a process to kill."""
+    pid = _hwnd_pids.get(hwnd)
+    if pid is None:
+        pid = get_window_pid(hwnd)
+        if len(_hwnd_pids) >= _HWND_PIDS_MAX:
+            _hwnd_pids.clear()
+        _hwnd_pids[hwnd] = pid
+    return pid
+
+def list_visible_windows():
+    """
+    Returns (hwnd, title, pid) for every visible top-level window that has a
+    title. PIDs are looked up fresh, never from the HWND cache: callers
+    decide which processes to terminate from them, and HWNDs get reused.
+    """
+    windows = []
+
+    def collect(hwnd, _):
+        if win32gui.IsWindowVisible(hwnd):
+            title = win32gui.GetWindowText(hwnd)
+            if title.strip():
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                windows.append((hwnd, title, pid))
         return True
 
-    return False
+    win32gui.EnumWindows(collect, None)
+    return windows
 
-def get_active_window_pid():
-    """Returns the Process ID (PID) of the currently active window."""
+def get_active_window_pid(cached=False):
+    """
+    Returns the Process ID (PID) of the currently active window. cached=True
+    goes through the HWND cache; only for checks that don't kill anything.
+    """
     if not WINDOWS_AVAILABLE:
         return None
     try:
-        hwnd = win32gui.GetForegroundWindow()
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        return pid
+        hwnd = get_foreground_hwnd()
+        return get_cached_window_pid(hwnd) if cached else get_window_pid(hwnd)
     except:
         return None
 
@@ -50,7 +155,8 @@ def get_active_window():
     if not WINDOWS_AVAILABLE:
         return None
     try:
-        return gw.getActiveWindow()
+        hwnd = get_foreground_hwnd()
+        return gw.Win32Window(hwnd) if hwnd else None
     except:
         return None
 
@@ -0,0 +1,57 @@
+import math
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "app"))
+
+import gaze  # noqa: E402
+
+IMG_W = IMG_H = 640
+
+
+def _turned_face(yaw_degrees):
+    """Eye corners and chin of a face turned by yaw_degrees, as in an unmirrored frame.
+
+    Positive yaw_degrees is a turn to the subject's left, which brings the
+    image-left eye (the subject's right eye, landmark 33) towards the camera.
+    """
+    half_eye = 0.1
+    dx = half_eye * math.cos(math.radians(yaw_degrees))
+    dz = half_eye * math.sin(math.radians(yaw_degrees))
+    landmarks = {
+        33: SimpleNamespace(x=0.5 - dx, y=0.4, z=-dz),
+        263: SimpleNamespace(x=0.5 + dx, y=0.4, z=dz),
+        199: SimpleNamespace(x=0.5, y=0.7, z=0.0),
+    }
+    return landmarks
+
+
+def _mirror(landmarks):
+    """The same landmarks as seen on a horizontally flipped frame."""
+    return {
+        33: SimpleNamespace(x=1 - landmarks[263].x, y=landmarks[263].y, z=landmarks[263].z),
+        263: SimpleNamespace(x=1 - landmarks[33].x, y=landmarks[33].y, z=landmarks[33].z),
+        199: SimpleNamespace(x=1 - landmarks[199].x, y=landmarks[199].y, z=landmarks[199].z),
+    }
+
+
+def test_turn_to_subjects_left_is_negative_yaw():
+    _, yaw = gaze._head_angles(_turned_face(40), IMG_W, IMG_H)
+    assert yaw == pytest.approx(-40, abs=0.5)
+    violation, direction_id = gaze._classify(yaw, 0.0, gaze.YAW_THRESHOLD, gaze.PITCH_THRESHOLD)
+    assert violation
+    assert gaze.DIRECTIONS[direction_id] == "looking_left"
+
+
+def test_mirrored_landmarks_flip_yaw_sign():
+    landmarks = _turned_face(40)
+    _, yaw = gaze._head_angles(landmarks, IMG_W, IMG_H)
+    _, mirrored_yaw = gaze._head_angles(_mirror(landmarks), IMG_W, IMG_H)
+    assert yaw < 0 < mirrored_yaw
+    assert mirrored_yaw == pytest.approx(-yaw, abs=0.5)
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useRef, useState } from "react";
-import { captureFrame } from "@/lib/camera";
+import { captureFrameBlob } from "@/lib/camera";
 
 const MAX_VIOLATIONS = 3;
 const PROCTORING_SERVICE_URL = process.env.NEXT_PUBLIC_PROCTOR_URL ?? "http://localhost:8000";
@@ -70,12 +70,14 @@ export function useProctoring(attemptId: string, onLock: () => void) {
           // Skip if video not ready
           return;
         }
-        const frame = captureFrame(v);
+        const frame = await captureFrameBlob(v);
 
-        const res = await fetch(`${PROCTORING_SERVICE_URL}/verify-gaze`, {
+        // Raw JPEG body: no base64 inflation or JSON parsing on the service
+        const params = new URLSearchParams({ session_id: attemptId });
+        const res = await fetch(`${PROCTORING_SERVICE_URL}/verify-gaze-raw?${params}`, {
           method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ image: frame }),
+          headers: { "Content-Type": "image/jpeg" },
+          body: frame,
         });
 
         if (!res.ok) {
@@ -9,3 +9,21 @@ export function captureFrame(video){
 
   return canvas.toDataURL("image/jpeg", 0.7).split(",")[1];
 }
+
+export function captureFrameBlob(video){
+  const canvas = document.createElement("canvas");
+  canvas.width = video.videoWidth;
+  canvas.height = video.videoHeight;
+
+  const ctx = canvas.getContext("2d");
+  if (!ctx) throw new Error("Failed to get 2D context");
+  ctx.drawImage(video, 0, 0);
+
+  return new Promise((resolve, reject) => {
+    canvas.toBlob(
+      (blob) => (blob ? resolve(blob) : reject(new Error("Failed to encode frame"))),
+      "image/jpeg",
+      0.7
+    );
+  });
+}